@@ -4,7 +4,7 @@ from langchain_core.tools import BaseTool, tool
 from app.config import settings
 import json
 from typing import Dict, List, Union
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ValidationError
 import logging
 from app.prompts.extract_tasks import extract_tasks_prompt
 from app.services import google_calendar_service
@@ -53,7 +53,12 @@ class TaskManagementAgent:
             try:
                 tasks_data = self.extract_tasks_from_text(text)
                 logger.info(f"Tasks data: {tasks_data}")
-                tasks = [Task(**task) for task in tasks_data["tasks"]]
+                tasks = []
+                for task in tasks_data["tasks"]:
+                    try:
+                        tasks.append(Task.model_validate(task).to_record())
+                    except ValidationError as e:
+                        logger.warning(f"Skipping invalid task {task}: {e}")
                 return self.google_calendar_service.add_task(tasks)
             except Exception as e:
                 logger.error(f"Error adding tasks: {e}")
@@ -12,6 +12,16 @@ class Settings(BaseSettings):
     # Settings for Local LLM (e.g., Ollama)
     OLLAMA_BASE_URL: str = "http://88.218.170.42:11434"
     LOCAL_LLM_MODEL_NAME: str = "gemma3:1b" # Default to mistral, user can change in .env
+
+    # Speech-to-text: голосовые длиннее лимита декодируются с низким приоритетом,
+    # после всех обычных
+    STT_MAX_DURATION_SECONDS: float = 120.0
+    STT_DECODE_WORKERS: int = 4
+
+    # Кэш расшифровок голосовых: размер - число расшифровок в памяти,
+    # путь к SQLite-файлу, пустая строка - только память
+    TRANSCRIPT_CACHE_SIZE: int = 1000
+    TRANSCRIPT_CACHE_PATH: str = ""
     
     class Config:
         env_file = ".env"
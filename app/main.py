@@ -9,7 +9,8 @@ from telegram.ext import (
 from app.config import settings
 import logging
 import os
-from app.services import speech_to_text_service
+from app.services import speech_to_text_service, transcript_cache
+from app.services.transcript_cache import content_key
 import json 
 import asyncio
 from app.agents import task_management_agent
@@ -68,14 +69,31 @@ async def handle_voice_message(
         return
 
     file_id = update.message.voice.file_id
+    file_unique_id = update.message.voice.file_unique_id
+    file_path = f"{file_id}.oga"
     try:
-        voice_file = await context.bot.get_file(file_id)
-        file_path = f"{file_id}.oga"
-        await voice_file.download_to_drive(custom_path=file_path)
-        logger.info(f"Voice message saved to {file_path}")
-
-        transcribed_text = speech_to_text_service.transcribe_audio(file_path)
+        # Пересланные голосовые имеют тот же file_unique_id - не скачиваем их повторно.
+        # Кэш может ходить в SQLite, поэтому вызываем его вне event loop
+        transcribed_text = await asyncio.to_thread(
+            transcript_cache.get_by_unique_id, file_unique_id
+        )
+        if transcribed_text is None:
+            voice_file = await context.bot.get_file(file_id)
+            await voice_file.download_to_drive(custom_path=file_path)
+            logger.info(f"Voice message saved to {file_path}")
+
+            audio_key = await asyncio.to_thread(content_key, file_path)
+            transcribed_text = await asyncio.to_thread(
+                transcript_cache.get_by_content, audio_key, file_unique_id
+            )
+            if transcribed_text is None:
+                transcribed_text = await speech_to_text_service.transcribe_audio(file_path)
+                if transcribed_text and not transcribed_text.startswith("Error:"):
+                    await asyncio.to_thread(
+                        transcript_cache.put, audio_key, file_unique_id, transcribed_text
+                    )
         logger.info(f"Transcribed text: {transcribed_text}")
+        logger.info(f"Transcript cache stats: {transcript_cache.stats()}")
 
         if transcribed_text and not transcribed_text.startswith("Error:"):
             result_data = task_management_agent.process_user_request(
@@ -119,7 +137,13 @@ async def handle_voice_message(
 
 async def main_async():
     """Start the bot and FastAPI app."""
-    application = Application.builder().token(settings.TELEGRAM_BOT_TOKEN).build()
+    # concurrent_updates: пока голосовое распознаётся, бот обрабатывает другие сообщения
+    application = (
+        Application.builder()
+        .token(settings.TELEGRAM_BOT_TOKEN)
+        .concurrent_updates(True)
+        .build()
+    )
 
     application.add_handler(CommandHandler("start", start_command))
     application.add_handler(
@@ -1,4 +1,5 @@
 from .speech_to_text_service import speech_to_text_service
 from .google_calendar import google_calendar_service
+from .transcript_cache import transcript_cache
 
-__all__ = ["speech_to_text_service", "google_calendar_service"] 
\ No newline at end of file
+__all__ = ["speech_to_text_service", "google_calendar_service", "transcript_cache"] 
\ No newline at end of file
@@ -0,0 +1,131 @@
+import logging
+from dataclasses import dataclass
+from typing import List
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class PreprocessedAudio:
+    """Result of preprocessing: speech chunks (16-bit PCM) and duration info."""
+
+    chunks: List[bytes]
+    duration_seconds: float
+    speech_seconds: float
+
+
+class AudioPreprocessor:
+    """
+    Energy-based VAD over 16 kHz mono 16-bit PCM.
+
+    Trims leading/trailing silence and splits the audio at pauses into chunks
+    that can be decoded independently. All frame-level work is done with numpy.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        frame_ms: int = 30,
+        min_silence_ms: int = 500,
+        padding_ms: int = 200,
+        max_chunk_seconds: float = 30.0,
+        split_search_seconds: float = 5.0,
+        energy_floor: float = 100.0,
+        noise_ratio: float = 3.0,
+    ):
+        self.sample_rate = sample_rate
+        self.frame_len = sample_rate * frame_ms // 1000
+        self.min_silence_frames = max(1, min_silence_ms // frame_ms)
+        self.padding_frames = padding_ms // frame_ms
+        self.max_chunk_frames = max(2, int(max_chunk_seconds * 1000) // frame_ms)
+        # Long utterances are cut at the quietest frame within this window before the limit
+        self.split_search_frames = min(
+            self.max_chunk_frames - 1, max(1, int(split_search_seconds * 1000) // frame_ms)
+        )
+        self.energy_floor = energy_floor  # RMS below this is always silence
+        self.noise_ratio = noise_ratio  # speech must be this much louder than noise
+
+    def _frame_rms(self, samples: np.ndarray) -> np.ndarray:
+        n_frames = len(samples) // self.frame_len
+        frames = samples[: n_frames * self.frame_len].reshape(n_frames, self.frame_len)
+        return np.sqrt(np.mean(np.square(frames, dtype=np.float32), axis=1))
+
+    def _speech_mask(self, rms: np.ndarray) -> np.ndarray:
+        """Returns a boolean mask with one entry per frame: True if it contains speech."""
+
+        # Noise level is estimated from the quietest 10% of frames; the cap by
+        # peak level keeps notes without any pauses from being dropped entirely
+        noise = np.percentile(rms, 10)
+        threshold = max(self.energy_floor, min(noise * self.noise_ratio, rms.max() / 2))
+        mask = rms > threshold
+
+        # Close pauses shorter than min_silence so words are not cut apart,
+        # then pad speech on both sides so onsets/endings are kept
+        mask = self._close_gaps(mask, self.min_silence_frames)
+        if self.padding_frames:
+            kernel = np.ones(2 * self.padding_frames + 1, dtype=np.int32)
+            mask = np.convolve(mask.astype(np.int32), kernel, mode="same") > 0
+        return mask
+
+    @staticmethod
+    def _runs(mask: np.ndarray) -> np.ndarray:
+        """Returns an (n, 2) array of [start, end) frame indices of True runs."""
+        edges = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1)
+        return np.column_stack((starts, ends))
+
+    def _close_gaps(self, mask: np.ndarray, min_gap: int) -> np.ndarray:
+        gaps = self._runs(~mask)
+        if len(gaps) == 0:
+            return mask
+        # Leading/trailing silence is not a gap between words
+        inner = (gaps[:, 0] > 0) & (gaps[:, 1] < len(mask))
+        short = inner & (gaps[:, 1] - gaps[:, 0] < min_gap)
+        mask = mask.copy()
+        for start, end in gaps[short]:
+            mask[start:end] = True
+        return mask
+
+    def _split_points(self, rms: np.ndarray, start: int, end: int) -> List[int]:
+        """
+        Frame indices to cut a [start, end) run so that no piece exceeds
+        max_chunk_frames. Each cut is placed at the quietest frame of the last
+        split_search_frames before the limit, to avoid cutting mid-word.
+        """
+        points = [start]
+        while end - points[-1] > self.max_chunk_frames:
+            window_end = points[-1] + self.max_chunk_frames
+            window_start = window_end - self.split_search_frames
+            points.append(window_start + int(np.argmin(rms[window_start:window_end])))
+        points.append(end)
+        return points
+
+    def process(self, pcm: bytes) -> PreprocessedAudio:
+        samples = np.frombuffer(pcm, dtype=np.int16)
+        duration = len(samples) / self.sample_rate
+        if len(samples) < self.frame_len:
+            return PreprocessedAudio(chunks=[], duration_seconds=duration, speech_seconds=0.0)
+
+        rms = self._frame_rms(samples)
+        mask = self._speech_mask(rms)
+        chunks = []
+        speech_frames = 0
+        for start, end in self._runs(mask):
+            speech_frames += end - start
+            points = self._split_points(rms, start, end)
+            for piece_start, piece_end in zip(points, points[1:]):
+                chunks.append(
+                    samples[piece_start * self.frame_len : piece_end * self.frame_len].tobytes()
+                )
+
+        speech_seconds = speech_frames * self.frame_len / self.sample_rate
+        logger.info(
+            f"Audio preprocessed: {duration:.1f}s total, {speech_seconds:.1f}s speech, "
+            f"{len(chunks)} chunk(s)"
+        )
+        return PreprocessedAudio(
+            chunks=chunks, duration_seconds=duration, speech_seconds=speech_seconds
+        )
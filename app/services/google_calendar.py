@@ -1,4 +1,6 @@
-from typing import Dict, List, Union
+from dataclasses import dataclass
+from datetime import datetime as dt
+from typing import Any, Dict, List, Union
 import logging
 from pydantic import BaseModel
 
@@ -6,27 +8,62 @@ logger = logging.getLogger(__name__)
 
 
 class Task(BaseModel):
+    """
+    Задача в том виде, в котором её возвращает LLM.
+    Используется только для валидации ответа модели, дальше по коду ходит TaskRecord.
+    """
+
+    title: str
+    datetime: dt
+    duration_minutes: int
+
+    def to_record(self) -> "TaskRecord":
+        # Время без пояса (формат из промпта "YYYY-MM-DD HH:MM") считаем локальным
+        start = self.datetime
+        if start.tzinfo is None:
+            start = start.astimezone()
+        return TaskRecord(self.title, start, self.duration_minutes)
+
+
+@dataclass(slots=True, frozen=True)
+class TaskRecord:
+    """
+    Внутреннее представление задачи: время начала с часовым поясом
+    и длительность в минутах. Создаётся без pydantic-валидации.
+    """
+
     title: str
-    datetime: str
-    duration_minutes: str
+    start: dt
+    duration_minutes: int
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TaskRecord":
+        """Загрузка из хранилища: data - результат to_dict, повторно не валидируется."""
+        return cls(
+            data["title"], dt.fromisoformat(data["datetime"]), data["duration_minutes"]
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "title": self.title,
+            "datetime": self.start.isoformat(),
+            "duration_minutes": self.duration_minutes,
+        }
 
 
-def format_tasks_for_reply(tasks: List[Task], source_type: str = "сообщения") -> str:
+def format_tasks_for_reply(
+    tasks: List[TaskRecord], source_type: str = "сообщения"
+) -> str:
     if tasks and len(tasks) > 0:
         response_lines = [f"Я извлек следующие задачи из вашего {source_type}:"]
         for task in tasks:
-            title = task.title
-            dt_str = task.datetime
-            duration = task.duration_minutes
-
-            formatted_dt = dt_str
-            # Improve datetime readability if it's in YYYY-MM-DDTHH:MM format
-            if "T" in dt_str and len(dt_str.split("T")) == 2:
-                date_part, time_part = dt_str.split("T")
-                formatted_dt = f"{date_part} в {time_part}"
-
+            start = task.start
+            formatted_dt = (
+                f"{start.year:04d}-{start.month:02d}-{start.day:02d} "
+                f"в {start.hour:02d}:{start.minute:02d}"
+            )
             response_lines.append(
-                f"✅ {title} - {formatted_dt} (длительность: {duration} мин.)"
+                f"✅ {task.title} - {formatted_dt} (длительность: {task.duration_minutes} мин.)"
             )
         return "\n".join(response_lines)
     else:
@@ -34,14 +71,14 @@ def format_tasks_for_reply(tasks: List[Task], source_type: str = "сообщен
 
 
 class GoogleCalendarService:
-    def add_task(self, tasks: List[Task]) -> Dict[str, str]:
+    def add_task(self, tasks: List[TaskRecord]) -> Dict[str, str]:
         """
         Добавить новую задачу или событие в базу данных
         """
         response_message = ""
         for task in tasks:
             logger.info(
-                f"Adding task: {task.title} {task.datetime} {task.duration_minutes}"
+                f"Adding task: {task.title} {task.start.isoformat()} {task.duration_minutes}"
             )
 
         response_message = format_tasks_for_reply(
@@ -1,26 +1,79 @@
+import asyncio
+import itertools
 import json
 import os
 import logging
+import queue
 import subprocess
+import threading
+import wave
+from concurrent.futures import Future
+from typing import Any, Callable, Optional
 from vosk import Model, KaldiRecognizer
+from app.config import settings
+from app.services.audio_preprocessing import AudioPreprocessor, PreprocessedAudio
 # from pydub import AudioSegment # pydub is not used, can be removed if truly not needed. For now, keeping it commented.
 
 # Configure logging
 logging.basicConfig(level=logging.INFO) # Consider configuring logging centrally
 logger = logging.getLogger(__name__)
 
+SAMPLE_RATE = 16000
+
+
+class DecodeQueue:
+    """
+    Fixed pool of decode threads fed from a priority queue.
+
+    Workers always take regular-priority chunks first, so chunks of long notes
+    are decoded only when no regular note is waiting.
+    """
+
+    REGULAR = 0
+    LOW = 1
+
+    def __init__(self, workers: int):
+        self._queue = queue.PriorityQueue()
+        self._counter = itertools.count()  # keeps FIFO order within a priority
+        for i in range(workers):
+            threading.Thread(target=self._worker, name=f"stt-decode-{i}", daemon=True).start()
+
+    def submit(self, priority: int, fn: Callable[..., Any], *args: Any) -> Future:
+        future = Future()
+        self._queue.put((priority, next(self._counter), future, fn, args))
+        return future
+
+    def _worker(self) -> None:
+        while True:
+            _, _, future, fn, args = self._queue.get()
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fn(*args))
+            except BaseException as e:
+                future.set_exception(e)
+
+
 class SpeechToTextService:
-    def __init__(self, model_path: str = "/usr/local/share/vosk/model"):
+    def __init__(
+        self,
+        model_path: str = "/usr/local/share/vosk/model",
+        max_duration_seconds: float = 120.0,
+        decode_workers: int = 4,
+    ):
+        self.preprocessor = AudioPreprocessor(sample_rate=SAMPLE_RATE)
+        # Notes longer than this are decoded with low priority, behind regular ones
+        self.max_duration_seconds = max_duration_seconds
+        self._decode_queue = DecodeQueue(decode_workers)
+
         # Check if model path exists, though in Docker it should be there
         if not os.path.exists(model_path):
             logger.warning(f"Vosk model path {model_path} does not exist. Transcription will fail.")
             # Depending on requirements, could raise an error or allow to proceed without a model
             self.model = None
-            self.recognizer = None
             return
 
         self.model = Model(model_path)
-        self.recognizer = KaldiRecognizer(self.model, 16000) # 16kHz sample rate
 
     def _convert_to_wav(self, audio_path: str) -> str:
         """Converts audio to WAV format (16 kHz, mono, 16-bit PCM)."""
@@ -50,49 +103,40 @@ class SpeechToTextService:
             logger.error("ffmpeg command not found. Please ensure ffmpeg is installed and in PATH.")
             raise
 
-    def transcribe_audio(self, audio_path: str) -> str:
-        """Transcribes audio to text using Vosk."""
-        if not self.model or not self.recognizer:
-            logger.error("Vosk model or recognizer not initialized. Transcription aborted.")
-            return "Error: Speech recognition service not available."
+    def _decode_chunk(self, pcm: bytes) -> str:
+        """Decodes one speech chunk with its own recognizer (recognizers are stateful)."""
+        recognizer = KaldiRecognizer(self.model, SAMPLE_RATE)
+        result_parts = []
+        for offset in range(0, len(pcm), 8000):
+            if recognizer.AcceptWaveform(pcm[offset : offset + 8000]):
+                text = json.loads(recognizer.Result()).get("text", "")
+                if text: # Append only if there's text
+                    logger.info(f"Intermediate result: {text}")
+                    result_parts.append(text)
 
+        final_text = json.loads(recognizer.FinalResult()).get("text", "")
+        if final_text: # Append only if there's text
+            logger.info(f"Final result: {final_text}")
+            result_parts.append(final_text)
+        return " ".join(result_parts)
+
+    def _load_speech(self, audio_path: str) -> Optional[PreprocessedAudio]:
+        """Converts audio to 16 kHz PCM and splits it into speech chunks. Blocking."""
         try:
             wav_path = self._convert_to_wav(audio_path)
         except Exception as e:
             logger.error(f"Failed to convert audio to WAV: {e}")
-            return "Error: Could not process audio file for transcription."
+            return None
 
-        result_parts = []
-        logger.info("Starting speech recognition...")
         logger.info(f"Opening file: {wav_path}")
-        
         if not os.path.exists(wav_path):
             logger.error(f"WAV file {wav_path} does not exist after conversion attempt.")
-            return "Error: Processed audio file not found."
+            return None
 
         try:
-            with open(wav_path, "rb") as f:
-                while True:
-                    data = f.read(4000) # Read in chunks
-                    if len(data) == 0:
-                        break
-                    if self.recognizer.AcceptWaveform(data):
-                        part_result = json.loads(self.recognizer.Result())
-                        text = part_result.get("text", "")
-                        if text: # Append only if there's text
-                            logger.info(f"Intermediate result: {text}")
-                            result_parts.append(text)
-
-            final_result_json = self.recognizer.FinalResult()
-            final_result = json.loads(final_result_json)
-            final_text = final_result.get("text", "")
-            if final_text: # Append only if there's text
-                logger.info(f"Final result: {final_text}")
-                result_parts.append(final_text)
-        
-        except Exception as e:
-            logger.error(f"Error during transcription: {e}")
-            return "Error: Speech transcription failed."
+            with wave.open(wav_path, "rb") as wav_file:
+                pcm = wav_file.readframes(wav_file.getnframes())
+            return self.preprocessor.process(pcm)
         finally:
             # Clean up the temporary WAV file
             if os.path.exists(wav_path):
@@ -101,11 +145,45 @@ class SpeechToTextService:
                     logger.info(f"Temporary WAV file {wav_path} removed.")
                 except OSError as e:
                     logger.error(f"Error removing temporary WAV file {wav_path}: {e}")
-        
+
+    async def transcribe_audio(self, audio_path: str) -> str:
+        """Transcribes audio to text using Vosk without blocking the event loop."""
+        if not self.model:
+            logger.error("Vosk model not initialized. Transcription aborted.")
+            return "Error: Speech recognition service not available."
+
+        logger.info("Starting speech recognition...")
+        try:
+            audio = await asyncio.to_thread(self._load_speech, audio_path)
+            if audio is None:
+                return "Error: Could not process audio file for transcription."
+
+            priority = DecodeQueue.REGULAR
+            if audio.duration_seconds > self.max_duration_seconds:
+                logger.info(
+                    f"Audio is {audio.duration_seconds:.1f}s long "
+                    f"(limit {self.max_duration_seconds:.0f}s), decoding with low priority"
+                )
+                priority = DecodeQueue.LOW
+            result_parts = await asyncio.gather(
+                *(
+                    asyncio.wrap_future(
+                        self._decode_queue.submit(priority, self._decode_chunk, chunk)
+                    )
+                    for chunk in audio.chunks
+                )
+            )
+        except Exception as e:
+            logger.error(f"Error during transcription: {e}")
+            return "Error: Speech transcription failed."
+
         full_text = " ".join(filter(None, result_parts)).strip()
         logger.info(f"Transcription complete. Full text: {full_text}")
         return full_text
 
 # Global instance for easy import, similar to gigachat_service
 # Consider dependency injection for more complex applications
-speech_to_text_service = SpeechToTextService() 
\ No newline at end of file
+speech_to_text_service = SpeechToTextService(
+    max_duration_seconds=settings.STT_MAX_DURATION_SECONDS,
+    decode_workers=settings.STT_DECODE_WORKERS,
+)
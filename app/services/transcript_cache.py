@@ -0,0 +1,202 @@
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Union
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def content_key(path: str) -> str:
+    """Cache key for audio bytes: sha256 of the file content."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(65536), b""):
+            digest.update(block)
+    return f"sha256:{digest.hexdigest()}"
+
+
+class TranscriptCache:
+    """
+    Bounded transcript cache: in-memory LRU in front of an optional SQLite store.
+
+    Each transcript is stored once under the content hash of its audio (see
+    content_key). Telegram file_unique_id values are aliases pointing to that
+    hash, so a forwarded voice note is found before it is downloaded and a
+    re-uploaded one is found before ffmpeg/Vosk run. max_entries and
+    max_disk_entries count transcripts, not keys.
+
+    Methods block on SQLite I/O; call them from a worker thread in async code.
+    """
+
+    def __init__(self, max_entries: int = 1000, db_path: str = "", max_disk_entries: int = 100_000):
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        # The disk store is pruned only after it grows this much over the bound
+        self._disk_slack = max(1, max_disk_entries // 10)
+        self._texts: "OrderedDict[str, str]" = OrderedDict()  # audio_key -> text
+        self._aliases: "OrderedDict[str, str]" = OrderedDict()  # file_unique_id -> audio_key
+        self._lock = threading.Lock()
+
+        # Counted once per voice message (see get_by_unique_id)
+        self.messages = 0
+        self.unique_id_hits = 0
+        self.content_hits = 0
+        # Where the hits were served from
+        self.memory_hits = 0
+        self.disk_hits = 0
+
+        self._db = None
+        self._disk_count = 0
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS transcripts (
+                    audio_key TEXT PRIMARY KEY, text TEXT NOT NULL, last_used REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS transcripts_last_used ON transcripts (last_used);
+                CREATE TABLE IF NOT EXISTS aliases (
+                    file_unique_id TEXT PRIMARY KEY, audio_key TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS aliases_audio_key ON aliases (audio_key);
+                """
+            )
+            self._disk_count = self._db.execute("SELECT COUNT(*) FROM transcripts").fetchone()[0]
+
+    @staticmethod
+    def _remember(lru: "OrderedDict[str, str]", key: str, value: str, limit: int) -> None:
+        lru[key] = value
+        lru.move_to_end(key)
+        while len(lru) > limit:
+            lru.popitem(last=False)
+
+    def _touch(self, audio_key: str) -> None:
+        """Refreshes last_used on disk so the store is pruned in LRU order."""
+        if self._db is not None:
+            self._db.execute(
+                "UPDATE transcripts SET last_used = ? WHERE audio_key = ?", (time.time(), audio_key)
+            )
+            self._db.commit()
+
+    def _get_text(self, audio_key: str) -> Optional[str]:
+        text = self._texts.get(audio_key)
+        if text is not None:
+            self._texts.move_to_end(audio_key)
+            self.memory_hits += 1
+            self._touch(audio_key)
+            return text
+
+        if self._db is not None:
+            row = self._db.execute(
+                "SELECT text FROM transcripts WHERE audio_key = ?", (audio_key,)
+            ).fetchone()
+            if row is not None:
+                self._remember(self._texts, audio_key, row[0], self.max_entries)
+                self.disk_hits += 1
+                self._touch(audio_key)
+                return row[0]
+        return None
+
+    def _resolve_alias(self, file_unique_id: str) -> Optional[str]:
+        audio_key = self._aliases.get(file_unique_id)
+        if audio_key is not None:
+            self._aliases.move_to_end(file_unique_id)
+            return audio_key
+        if self._db is not None:
+            row = self._db.execute(
+                "SELECT audio_key FROM aliases WHERE file_unique_id = ?", (file_unique_id,)
+            ).fetchone()
+            if row is not None:
+                self._remember(self._aliases, file_unique_id, row[0], self.max_entries)
+                return row[0]
+        return None
+
+    def _add_alias(self, file_unique_id: str, audio_key: str) -> None:
+        self._remember(self._aliases, file_unique_id, audio_key, self.max_entries)
+        if self._db is not None:
+            self._db.execute(
+                "INSERT OR REPLACE INTO aliases (file_unique_id, audio_key) VALUES (?, ?)",
+                (file_unique_id, audio_key),
+            )
+            self._db.commit()
+
+    def get_by_unique_id(self, file_unique_id: str) -> Optional[str]:
+        """First lookup for a voice message; counts the message for hit-rate metrics."""
+        with self._lock:
+            self.messages += 1
+            audio_key = self._resolve_alias(file_unique_id)
+            text = self._get_text(audio_key) if audio_key is not None else None
+            if text is not None:
+                self.unique_id_hits += 1
+            return text
+
+    def get_by_content(self, audio_key: str, file_unique_id: str) -> Optional[str]:
+        """Second lookup after download; on a hit file_unique_id becomes an alias."""
+        with self._lock:
+            text = self._get_text(audio_key)
+            if text is not None:
+                self.content_hits += 1
+                self._add_alias(file_unique_id, audio_key)
+            return text
+
+    def put(self, audio_key: str, file_unique_id: str, text: str) -> None:
+        with self._lock:
+            self._remember(self._texts, audio_key, text, self.max_entries)
+            self._remember(self._aliases, file_unique_id, audio_key, self.max_entries)
+            if self._db is None:
+                return
+
+            now = time.time()
+            inserted = self._db.execute(
+                "INSERT OR IGNORE INTO transcripts (audio_key, text, last_used) VALUES (?, ?, ?)",
+                (audio_key, text, now),
+            ).rowcount
+            if inserted:
+                self._disk_count += 1
+            else:
+                self._db.execute(
+                    "UPDATE transcripts SET text = ?, last_used = ? WHERE audio_key = ?",
+                    (text, now, audio_key),
+                )
+            self._db.execute(
+                "INSERT OR REPLACE INTO aliases (file_unique_id, audio_key) VALUES (?, ?)",
+                (file_unique_id, audio_key),
+            )
+            if self._disk_count > self.max_disk_entries + self._disk_slack:
+                self._prune()
+            self._db.commit()
+
+    def _prune(self) -> None:
+        """Drops least recently used transcripts together with their aliases."""
+        evicted = self._db.execute(
+            "SELECT audio_key FROM transcripts ORDER BY last_used LIMIT ?",
+            (self._disk_count - self.max_disk_entries,),
+        ).fetchall()
+        self._db.executemany("DELETE FROM transcripts WHERE audio_key = ?", evicted)
+        self._db.executemany("DELETE FROM aliases WHERE audio_key = ?", evicted)
+        self._disk_count -= len(evicted)
+        logger.info(f"Transcript cache pruned {len(evicted)} entries from disk")
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        hits = self.unique_id_hits + self.content_hits
+        return {
+            "messages": self.messages,
+            "unique_id_hits": self.unique_id_hits,
+            "content_hits": self.content_hits,
+            "misses": self.messages - hits,
+            "hit_rate": hits / self.messages if self.messages else 0.0,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "memory_entries": len(self._texts),
+            "disk_entries": self._disk_count,
+        }
+
+
+transcript_cache = TranscriptCache(
+    max_entries=settings.TRANSCRIPT_CACHE_SIZE,
+    db_path=settings.TRANSCRIPT_CACHE_PATH,
+)
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Микробенчмарк представления задач: создание, загрузка, сериализация и форматирование.
+
+Модуль google_calendar загружается по пути к файлу, чтобы не импортировать
+пакет app.services (Vosk, пулы распознавания, Settings из .env).
+"""
+import importlib.util
+import json
+import timeit
+from pathlib import Path
+
+MODULE_PATH = Path(__file__).resolve().parent.parent / "app" / "services" / "google_calendar.py"
+
+
+def load_google_calendar():
+    spec = importlib.util.spec_from_file_location("google_calendar", MODULE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def main(n: int = 10_000, repeat: int = 5):
+    gc = load_google_calendar()
+    raw_tasks = [
+        {"title": f"Задача {i}", "datetime": "2024-07-21 10:00", "duration_minutes": "30"}
+        for i in range(n)
+    ]
+    validated = [gc.Task.model_validate(raw) for raw in raw_tasks]
+    records = [task.to_record() for task in validated]
+    stored = [record.to_dict() for record in records]
+
+    benchmarks = {
+        "validate (Task.model_validate)": lambda: [
+            gc.Task.model_validate(raw) for raw in raw_tasks
+        ],
+        "convert (Task.to_record)": lambda: [task.to_record() for task in validated],
+        "load (TaskRecord.from_dict)": lambda: [
+            gc.TaskRecord.from_dict(data) for data in stored
+        ],
+        "serialize (to_dict + json.dumps)": lambda: json.dumps(
+            [record.to_dict() for record in records], ensure_ascii=False
+        ),
+        "format_tasks_for_reply": lambda: gc.format_tasks_for_reply(records),
+    }
+    for name, func in benchmarks.items():
+        best = min(timeit.repeat(func, number=1, repeat=repeat))
+        print(f"{name:<40} {best * 1000:8.2f} ms / {n} задач")
+
+
+if __name__ == "__main__":
+    main()